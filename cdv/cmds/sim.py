@@ -1,20 +1,144 @@
 import asyncio
+import atexit
+import contextvars
+import shlex
+import sys
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Coroutine, Dict, List, Optional, TextIO, Tuple, TypeVar, cast
 
 import click
-from chia.util.config import load_config
-
-from cdv.cmds.sim_utils import (
-    SIMULATOR_ROOT_PATH,
-    async_config_wizard,
-    execute_with_simulator,
-    farm_blocks,
-    print_status,
-    revert_block_height,
-    set_auto_farm,
-    start_async,
-)
+
+from cdv.cmds.sim_paths import SIMULATOR_ROOT_PATH
+
+_T = TypeVar("_T")
+_runner: Any = None
+
+BATCH_COMMANDS = ("status", "revert", "farm", "autofarm")
+_GROUPS_NO_WALLET: Tuple[str, ...] = ("simulator",)
+_GROUPS_WITH_WALLET: Tuple[str, ...] = ("simulator", "wallet")
+_Operation = Tuple[Callable, Tuple[Any, ...]]
+
+
+class _SimContext:
+    """
+    State shared by the sim subcommands, the root path is only built once a subcommand needs it.
+    """
+
+    def __init__(self, root_path: Path, sim_name: str, rpc_port: Optional[int]) -> None:
+        self._root_path = root_path
+        self.sim_name = sim_name
+        self.rpc_port = rpc_port
+        self.batch: Optional[List[_Operation]] = None
+
+    @cached_property
+    def root_path(self) -> Path:
+        return self._root_path / self.sim_name
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    try:
+        if sys.platform == "win32":
+            import winloop as fast_loop
+        else:
+            import uvloop as fast_loop
+    except ImportError:
+        return asyncio.new_event_loop()
+    loop: asyncio.AbstractEventLoop = fast_loop.new_event_loop()
+    return loop
+
+
+class _LegacyRunner:
+    """
+    Minimal stand-in for asyncio.Runner on python versions older than 3.11.
+    """
+
+    def __init__(self) -> None:
+        self._loop = _new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+    def run(self, coro: Coroutine[Any, Any, _T], context: Optional[contextvars.Context] = None) -> _T:
+        return self._loop.run_until_complete(coro)
+
+    def close(self) -> None:
+        # same teardown as asyncio.run: cancel leftover tasks, then close async generators and the executor.
+        try:
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            if hasattr(self._loop, "shutdown_default_executor"):  # python 3.9+
+                self._loop.run_until_complete(self._loop.shutdown_default_executor())
+        finally:
+            asyncio.set_event_loop(None)
+            self._loop.close()
+
+
+def _run(coro: Coroutine[Any, Any, _T]) -> _T:
+    """
+    Run a coroutine on the event loop shared by every command in this process.
+    The loop is created on first use (with uvloop / winloop if installed) and closed at exit.
+    """
+    global _runner
+    if _runner is None:
+        if sys.version_info >= (3, 11):
+            _runner = asyncio.Runner(loop_factory=_new_event_loop)
+        else:
+            _runner = _LegacyRunner()
+        atexit.register(_runner.close)
+    result: _T = _runner.run(coro, context=contextvars.Context())
+    return result
+
+
+class _OnOff(click.Choice):
+    """
+    An 'on' / 'off' choice that converts straight to a bool while parsing.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(["on", "off"])
+
+    def convert(self, value: Any, param: Optional[click.Parameter], ctx: Optional[click.Context]) -> bool:
+        choice: str = super().convert(value, param, ctx)
+        return choice == "on"
+
+
+def _submit(ctx: click.Context, function: Callable, *args) -> None:
+    """
+    Run function against the simulator, or queue it if we are collecting operations for 'cdv sim batch'.
+    """
+    if ctx.obj.batch is not None:
+        ctx.obj.batch.append((function, args))
+        return
+    from cdv.cmds.sim_utils import execute_with_simulator
+
+    _run(execute_with_simulator(ctx.obj.rpc_port, ctx.obj.root_path, function, True, *args))
+
+
+async def _run_batch(
+    node_client: Any,
+    config: Dict[str, Any],
+    operations: List[Tuple[int, _Operation]],
+    concurrency: int,
+    timeout: Optional[float],
+) -> None:
+    """
+    Run the queued batch operations, keyed by their line number, with one rpc client.
+    At most concurrency of them run at a time.
+    """
+    from cdv.cmds.sim_utils import call_with_simulator_client
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_bounded(line_number: int, function: Callable, args: Tuple[Any, ...]) -> None:
+        async with semaphore:
+            try:
+                await asyncio.wait_for(call_with_simulator_client(node_client, config, function, True, *args), timeout)
+            except asyncio.TimeoutError:
+                print(f"Line {line_number}: operation timed out after {timeout} seconds")
+
+    await asyncio.gather(*(run_bounded(line_number, function, args) for line_number, (function, args) in operations))
 
 
 @click.group("sim", short_help="Configure and make requests to a Chia Simulator Full Node")
@@ -29,7 +153,11 @@ from cdv.cmds.sim_utils import (
     default=None,
 )
 @click.option(
-    "--root-path", default=SIMULATOR_ROOT_PATH, help="Simulator root folder.", type=click.Path(), show_default=True
+    "--root-path",
+    default=SIMULATOR_ROOT_PATH,
+    help="Simulator root folder.",
+    type=click.Path(path_type=Path, file_okay=False, dir_okay=True, resolve_path=True),
+    show_default=True,
 )
 @click.option(
     "-n",
@@ -39,11 +167,8 @@ from cdv.cmds.sim_utils import (
     default="main",
 )
 @click.pass_context
-def sim_cmd(ctx: click.Context, rpc_port: Optional[int], root_path: str, simulator_name: str) -> None:
-    ctx.ensure_object(dict)
-    ctx.obj["root_path"] = Path(root_path) / simulator_name
-    ctx.obj["sim_name"] = simulator_name
-    ctx.obj["rpc_port"] = rpc_port
+def sim_cmd(ctx: click.Context, rpc_port: Optional[int], root_path: Path, simulator_name: str) -> None:
+    ctx.obj = _SimContext(root_path, simulator_name, rpc_port)
 
 
 @sim_cmd.command("create", short_help="Guides you through the process of setting up a Chia Simulator")
@@ -79,13 +204,15 @@ def create_simulator_config(
     docker_mode: bool,
     no_bitfield: bool,
 ) -> None:
-    print(f"Using this Directory: {ctx.obj['root_path']}\n")
+    from cdv.cmds.sim_utils import async_config_wizard
+
+    print(f"Using this Directory: {ctx.obj.root_path}\n")
     if fingerprint and mnemonic:
         print("You can't use both a fingerprint and a mnemonic. Please choose one.")
         return None
-    asyncio.run(
+    _run(
         async_config_wizard(
-            ctx.obj["root_path"],
+            ctx.obj.root_path,
             fingerprint,
             reward_address,
             plot_directory,
@@ -102,10 +229,10 @@ def create_simulator_config(
 @click.option("-w", "--wallet", is_flag=True, help="Start wallet")
 @click.pass_context
 def start_cmd(ctx: click.Context, restart: bool, wallet: bool) -> None:
-    group: Any = ("simulator",)
-    if wallet:
-        group += ("wallet",)
-    asyncio.run(start_async(ctx.obj["root_path"], group, restart))
+    from cdv.cmds.sim_utils import start_async
+
+    group = _GROUPS_WITH_WALLET if wallet else _GROUPS_NO_WALLET
+    _run(start_async(ctx.obj.root_path, group, restart))
 
 
 @sim_cmd.command("stop", short_help="Stop running services")
@@ -113,15 +240,14 @@ def start_cmd(ctx: click.Context, restart: bool, wallet: bool) -> None:
 @click.option("-w", "--wallet", is_flag=True, help="Stop wallet")
 @click.pass_context
 def stop_cmd(ctx: click.Context, daemon: bool, wallet: bool) -> None:
-    import sys
-
     from chia.cmds.stop import async_stop
 
-    config = load_config(ctx.obj["root_path"], "config.yaml")
-    group: Any = ("simulator",)
-    if wallet:
-        group += ("wallet",)
-    sys.exit(asyncio.run(async_stop(ctx.obj["root_path"], config, group, daemon)))
+    from cdv.cmds.sim_utils import load_config_cached
+
+    config = load_config_cached(ctx.obj.root_path, "config.yaml")
+    group = _GROUPS_WITH_WALLET if wallet else _GROUPS_NO_WALLET
+    # chia annotates group as str, but async_stop iterates over it like a tuple of service groups.
+    sys.exit(_run(async_stop(ctx.obj.root_path, config, cast(Any, group), daemon)))
 
 
 @sim_cmd.command("status", short_help="Get information about the state of the simulator.")
@@ -139,18 +265,16 @@ def status_cmd(
     include_rewards: bool,
     show_addresses: bool,
 ) -> None:
-    asyncio.run(
-        execute_with_simulator(
-            ctx.obj["rpc_port"],
-            ctx.obj["root_path"],
-            print_status,
-            True,
-            fingerprint,
-            show_key,
-            show_coins,
-            include_rewards,
-            show_addresses,
-        )
+    from cdv.cmds.sim_utils import print_status
+
+    _submit(
+        ctx,
+        print_status,
+        fingerprint,
+        show_key,
+        show_coins,
+        include_rewards,
+        show_addresses,
     )
 
 
@@ -170,27 +294,27 @@ def status_cmd(
 def revert_cmd(
     ctx: click.Context, blocks: int, new_blocks: int, reset: bool, force: bool, disable_prompt: bool
 ) -> None:
+    from cdv.cmds.sim_utils import revert_block_height
+
     if force and not disable_prompt:
-        input_str = (
+        if not sys.stdin.isatty():
+            raise click.UsageError("Refusing to prompt on a non-interactive terminal, pass --disable_prompt instead.")
+        click.confirm(
             "Are you sure you want to force delete blocks? This should only ever be used in special circumstances,"
-            " and will break all wallets. \nPress 'y' to continue, or any other button to exit: "
+            " and will break all wallets.",
+            default=False,
+            abort=True,
         )
-        if input(input_str) != "y":
-            return
     if reset and blocks != 1:
         print("\nBlocks, '-b' must not be set if all blocks are selected by reset, '-r'. Exiting.\n")
         return
-    asyncio.run(
-        execute_with_simulator(
-            ctx.obj["rpc_port"],
-            ctx.obj["root_path"],
-            revert_block_height,
-            True,
-            blocks,
-            new_blocks,
-            reset,
-            force,
-        )
+    _submit(
+        ctx,
+        revert_block_height,
+        blocks,
+        new_blocks,
+        reset,
+        force,
     )
 
 
@@ -200,30 +324,78 @@ def revert_cmd(
 @click.option("-a", "--target-address", type=str, default="", help="Block reward address")
 @click.pass_context
 def farm_cmd(ctx: click.Context, blocks: int, non_transaction: bool, target_address: str) -> None:
-    asyncio.run(
-        execute_with_simulator(
-            ctx.obj["rpc_port"],
-            ctx.obj["root_path"],
-            farm_blocks,
-            True,
-            blocks,
-            not non_transaction,
-            target_address,
-        )
+    from cdv.cmds.sim_utils import farm_blocks
+
+    _submit(
+        ctx,
+        farm_blocks,
+        blocks,
+        not non_transaction,
+        target_address,
     )
 
 
 @sim_cmd.command("autofarm", short_help="Enable or disable auto farming on transaction submission")
-@click.argument("set_autofarm", type=click.Choice(["on", "off"]), nargs=1, required=True)
+@click.argument("set_autofarm", type=_OnOff(), nargs=1, required=True)
 @click.pass_context
-def autofarm_cmd(ctx: click.Context, set_autofarm: str) -> None:
-    autofarm = bool(set_autofarm == "on")
-    asyncio.run(
-        execute_with_simulator(
-            ctx.obj["rpc_port"],
-            ctx.obj["root_path"],
-            set_auto_farm,
-            True,
-            autofarm,
+def autofarm_cmd(ctx: click.Context, set_autofarm: bool) -> None:
+    from cdv.cmds.sim_utils import set_auto_farm
+
+    _submit(ctx, set_auto_farm, set_autofarm)
+
+
+@sim_cmd.command("batch", short_help="Run many status, revert, farm and autofarm operations with one rpc client")
+@click.option(
+    "-f",
+    "--file",
+    "ops_file",
+    type=click.File("r"),
+    required=True,
+    help="File with one sim subcommand per line, e.g. 'farm -b 1'. Use '-' to read from stdin.",
+)
+@click.option(
+    "-c",
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Maximum number of operations to run at once. With more than 1 the file order is not kept.",
+)
+@click.option("-t", "--timeout", type=float, default=None, help="Cancel an operation after this many seconds.")
+@click.pass_context
+def batch_cmd(ctx: click.Context, ops_file: TextIO, concurrency: int, timeout: Optional[float]) -> None:
+    from cdv.cmds.sim_utils import execute_with_simulator
+
+    operations: List[Tuple[int, _Operation]] = []
+    try:
+        for line_number, line in enumerate(ops_file, start=1):
+            args = shlex.split(line, comments=True)
+            if len(args) == 0:
+                continue
+            if args[0] not in BATCH_COMMANDS:
+                raise click.UsageError(
+                    f"Line {line_number}: '{args[0]}' can not be used in a batch, choose from: "
+                    f"{', '.join(BATCH_COMMANDS)}"
+                )
+            command = sim_cmd.commands[args[0]]
+            ctx.obj.batch = []
+            try:
+                sub_ctx = command.make_context(args[0], args[1:], parent=ctx)
+                try:
+                    command.invoke(sub_ctx)
+                finally:
+                    sub_ctx.close()
+            except click.ClickException as e:
+                raise click.UsageError(f"Line {line_number}: {e.format_message()}") from e
+            except (click.exceptions.Exit, click.Abort) as e:
+                # e.g. '--help' or a declined prompt, don't run the rest of the file as if nothing happened.
+                raise click.UsageError(f"Line {line_number}: '{args[0]}' exited early, nothing was run.") from e
+            operations.extend((line_number, operation) for operation in ctx.obj.batch)
+    finally:
+        ctx.obj.batch = None
+    if len(operations) > 0:
+        _run(
+            execute_with_simulator(
+                ctx.obj.rpc_port, ctx.obj.root_path, _run_batch, True, operations, concurrency, timeout
+            )
         )
-    )
@@ -0,0 +1,5 @@
+import os
+from pathlib import Path
+
+# kept apart from sim_utils so that cdv/cmds/sim.py can use it without importing chia.
+SIMULATOR_ROOT_PATH = Path(os.path.expanduser(os.getenv("CHIA_SIMULATOR_ROOT", "~/.chia/simulator"))).resolve()
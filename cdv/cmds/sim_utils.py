@@ -1,9 +1,10 @@
 import asyncio
+import json
 import os
 import traceback
 from pathlib import Path, PureWindowsPath
 from random import randint
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from aiohttp import ClientConnectorError
 from blspy import PrivateKey
@@ -12,7 +13,7 @@ from chia.simulator.simulator_full_node_rpc_client import SimulatorFullNodeRpcCl
 from chia.types.blockchain_format.sized_bytes import bytes32
 from chia.types.coin_record import CoinRecord
 from chia.util.bech32m import decode_puzzle_hash, encode_puzzle_hash
-from chia.util.config import load_config, save_config
+from chia.util.config import config_path_for_filename, load_config, save_config
 from chia.util.ints import uint16, uint32
 from chia.util.keychain import Keychain, bytes_to_mnemonic
 from chia.wallet.derive_keys import (
@@ -22,40 +23,98 @@ from chia.wallet.derive_keys import (
     master_sk_to_wallet_sk_unhardened,
 )
 
-SIMULATOR_ROOT_PATH = Path(os.path.expanduser(os.getenv("CHIA_SIMULATOR_ROOT", "~/.chia/simulator"))).resolve()
+# re-exported for existing importers
+from cdv.cmds.sim_paths import SIMULATOR_ROOT_PATH  # noqa: F401
 
 
-# based on execute_with_node
-async def execute_with_simulator(
-    rpc_port: Optional[int], root_path: Path, function: Callable, catch_errors: bool = True, *args
-) -> Any:
+def load_config_cached(root_path: Path, filename: str) -> Dict[str, Any]:
+    """
+    Drop-in replacement for load_config that keeps a json copy of the parsed yaml next to the original.
+    The copy is keyed by the mtime and size of the yaml file, so any edit to the config invalidates it.
+    """
+    config_path = config_path_for_filename(root_path, filename)
+    try:
+        stat = config_path.stat()
+    except OSError:
+        # let load_config report the missing config the same way chia does.
+        return load_config(root_path, filename)
+    cache_path = config_path.parent / f".{config_path.name}.{stat.st_mtime_ns}-{stat.st_size}.json"
+    try:
+        with open(cache_path, "r") as f:
+            cached_config: Dict[str, Any] = json.load(f)
+        return cached_config
+    except (OSError, ValueError):
+        pass
+    config: Dict[str, Any] = load_config(root_path, filename)
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(config, f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # the cache is only an optimization, a read-only config directory is fine.
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return config
+    try:
+        for stale_path in config_path.parent.glob(f".{config_path.name}.*.json"):
+            if stale_path != cache_path:
+                stale_path.unlink()
+    except OSError:
+        pass
+    return config
 
-    result = None
-    config = load_config(root_path, "config.yaml")
+
+async def open_simulator_client(
+    rpc_port: Optional[int], root_path: Path
+) -> Tuple[SimulatorFullNodeRpcClient, Dict[str, Any]]:
+    """
+    Create a simulator rpc client, and return it together with the config it was created from.
+    The caller is responsible for closing the client.
+    """
+    config = load_config_cached(root_path, "config.yaml")
     self_hostname = config["self_hostname"]
     if rpc_port is None:
         rpc_port = config["full_node"]["rpc_port"]
-    try:
-        node_client: SimulatorFullNodeRpcClient = await SimulatorFullNodeRpcClient.create(
-            self_hostname, uint16(rpc_port), root_path, config
-        )
-        result = await function(node_client, config, *args)
+    node_client: SimulatorFullNodeRpcClient = await SimulatorFullNodeRpcClient.create(
+        self_hostname, uint16(rpc_port), root_path, config
+    )
+    return node_client, config
+
 
+async def call_with_simulator_client(
+    node_client: SimulatorFullNodeRpcClient,
+    config: Dict[str, Any],
+    function: Callable,
+    catch_errors: bool = True,
+    *args,
+) -> Any:
+    try:
+        return await function(node_client, config, *args)
     except Exception as e:
         if not catch_errors:
-            node_client.close()
-            await node_client.await_closed()
             raise e
         elif isinstance(e, ClientConnectorError):
-            print(f"Connection error. Check if simulator rpc is running at {rpc_port}")
+            print(f"Connection error. Check if simulator rpc is running at {node_client.port}")
             print("This is normal if full node is still starting up")
         else:
             tb = traceback.format_exc()
             print(f"Exception from 'sim' {tb}")
+    return None
+
 
-    node_client.close()
-    await node_client.await_closed()
-    return result
+# based on execute_with_node
+async def execute_with_simulator(
+    rpc_port: Optional[int], root_path: Path, function: Callable, catch_errors: bool = True, *args
+) -> Any:
+    node_client, config = await open_simulator_client(rpc_port, root_path)
+    try:
+        return await call_with_simulator_client(node_client, config, function, catch_errors, *args)
+    finally:
+        node_client.close()
+        await node_client.await_closed()
 
 
 async def start_async(root_path: Path, group: Any, restart: bool) -> None:
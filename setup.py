@@ -17,7 +17,6 @@ dev_dependencies = [
     "flake8",
     "mypy",
     "types-aiofiles",
-    "types-click",
     "types-cryptography",
     "types-pkg_resources",
     "types-pyyaml",
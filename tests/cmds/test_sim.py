@@ -0,0 +1,154 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+import pytest
+import yaml
+from click.testing import CliRunner, Result
+
+from cdv.cmds import sim, sim_utils
+from cdv.cmds.cli import cli
+from cdv.cmds.sim_utils import load_config_cached
+
+
+def write_config(root_path: Path, config: Dict[str, Any]) -> None:
+    (root_path / "config").mkdir(parents=True, exist_ok=True)
+    with open(root_path / "config" / "config.yaml", "w") as f:
+        yaml.safe_dump(config, f)
+
+
+def cache_files(root_path: Path) -> List[Path]:
+    return list((root_path / "config").glob(".config.yaml.*.json"))
+
+
+@pytest.fixture
+def sim_calls(monkeypatch) -> List[Tuple[str, Tuple[Any, ...]]]:
+    """
+    Replace the simulator rpc functions with recorders, so batches can run without a simulator.
+    """
+    calls: List[Tuple[str, Tuple[Any, ...]]] = []
+
+    def recorder(name: str):
+        async def record(node_client, config, *args):
+            calls.append((name, args))
+
+        return record
+
+    for name in ("farm_blocks", "print_status", "revert_block_height", "set_auto_farm"):
+        monkeypatch.setattr(sim_utils, name, recorder(name))
+
+    async def execute_with_simulator(rpc_port, root_path, function, catch_errors=True, *args):
+        return await function("node_client", {}, *args)
+
+    monkeypatch.setattr(sim_utils, "execute_with_simulator", execute_with_simulator)
+    return calls
+
+
+class TestLoadConfigCached:
+    def test_cache_hit(self, tmp_path, monkeypatch):
+        config: Dict[str, Any] = {"full_node": {"rpc_port": 1234}}
+        write_config(tmp_path, config)
+        assert load_config_cached(tmp_path, "config.yaml") == config
+        assert len(cache_files(tmp_path)) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("config.yaml should have been loaded from the cache")
+
+        monkeypatch.setattr(sim_utils, "load_config", fail)
+        assert load_config_cached(tmp_path, "config.yaml") == config
+
+    def test_invalidated_when_yaml_changes(self, tmp_path):
+        write_config(tmp_path, {"full_node": {"rpc_port": 1}})
+        assert load_config_cached(tmp_path, "config.yaml")["full_node"]["rpc_port"] == 1
+
+        write_config(tmp_path, {"full_node": {"rpc_port": 12345}})
+        assert load_config_cached(tmp_path, "config.yaml")["full_node"]["rpc_port"] == 12345
+
+    def test_stale_cache_files_are_pruned(self, tmp_path):
+        write_config(tmp_path, {"full_node": {"rpc_port": 1}})
+        load_config_cached(tmp_path, "config.yaml")
+        old_cache_files = cache_files(tmp_path)
+
+        write_config(tmp_path, {"full_node": {"rpc_port": 12345}})
+        load_config_cached(tmp_path, "config.yaml")
+        new_cache_files = cache_files(tmp_path)
+        assert len(new_cache_files) == 1
+        assert new_cache_files != old_cache_files
+
+    def test_tmp_file_removed_when_write_fails(self, tmp_path, monkeypatch):
+        config: Dict[str, Any] = {"full_node": {"rpc_port": 1234}}
+        write_config(tmp_path, config)
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(sim_utils.os, "replace", fail)
+        assert load_config_cached(tmp_path, "config.yaml") == config
+        assert list((tmp_path / "config").glob(".config.yaml.*")) == []
+
+    def test_missing_config(self, tmp_path, capsys):
+        with pytest.raises(SystemExit):
+            load_config_cached(tmp_path, "config.yaml")
+        assert "can't find" in capsys.readouterr().out
+
+
+class TestSimRevert:
+    def test_force_without_tty(self, sim_calls):
+        result: Result = CliRunner().invoke(cli, ["sim", "revert", "--force"])
+        assert result.exit_code != 0
+        assert "--disable_prompt" in result.output
+        assert sim_calls == []
+
+    def test_force_with_disabled_prompt(self, sim_calls):
+        result: Result = CliRunner().invoke(cli, ["sim", "revert", "--force", "-d", "-b", "2"])
+        assert result.exit_code == 0
+        assert sim_calls == [("revert_block_height", (2, 1, False, True))]
+
+    def test_declined_confirmation(self, sim_calls, monkeypatch):
+        monkeypatch.setattr(sim, "sys", SimpleNamespace(stdin=SimpleNamespace(isatty=lambda: True)))
+        result: Result = CliRunner().invoke(cli, ["sim", "revert", "--force"], input="n\n")
+        assert result.exit_code == 1
+        assert "Aborted!" in result.output
+        assert sim_calls == []
+
+
+class TestSimBatch:
+    def test_lines_run_in_file_order(self, sim_calls):
+        ops = "farm -b 2\n# a comment\n\nautofarm off\nstatus -c  # show coins\nrevert -b 3\n"
+        result: Result = CliRunner().invoke(cli, ["sim", "batch", "-f", "-"], input=ops)
+        assert result.exit_code == 0
+        assert sim_calls == [
+            ("farm_blocks", (2, True, "")),
+            ("set_auto_farm", (False,)),
+            ("print_status", (None, False, True, False, False)),
+            ("revert_block_height", (3, 1, False, False)),
+        ]
+
+    def test_unknown_command(self, sim_calls):
+        result: Result = CliRunner().invoke(cli, ["sim", "batch", "-f", "-"], input="farm\nstart\n")
+        assert result.exit_code != 0
+        assert "Line 2: 'start' can not be used in a batch" in result.output
+        assert sim_calls == []
+
+    def test_invalid_options(self, sim_calls):
+        result: Result = CliRunner().invoke(cli, ["sim", "batch", "-f", "-"], input="farm\nfarm --bogus\n")
+        assert result.exit_code != 0
+        assert "Line 2:" in result.output
+        assert sim_calls == []
+
+    def test_help_stops_the_batch(self, sim_calls):
+        result: Result = CliRunner().invoke(cli, ["sim", "batch", "-f", "-"], input="farm --help\nfarm\n")
+        assert result.exit_code != 0
+        assert "Line 1: 'farm' exited early" in result.output
+        assert sim_calls == []
+
+    def test_timeout(self, sim_calls, monkeypatch):
+        async def slow_farm(*args):
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(sim_utils, "farm_blocks", slow_farm)
+        result: Result = CliRunner().invoke(cli, ["sim", "batch", "-f", "-", "-t", "0.05"], input="status\nfarm\n")
+        assert result.exit_code == 0
+        assert "Line 2: operation timed out after 0.05 seconds" in result.output
+        assert [name for name, _ in sim_calls] == ["print_status"]